@@ -2,11 +2,14 @@
 # -*- coding: utf-8 -*-
 
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict
 
 from mcp.server.fastmcp import FastMCP
 
 from src.utils.git_utils import get_current_branch
 from src.utils.gitlab_utils import (
+    clear_response_cache,
     get_failed_jobs_output,
     get_merge_request,
     get_mr_changes,
@@ -27,22 +30,40 @@ def get_current_branch_name() -> str:
     return get_current_branch()
 
 
+# ブランチ名ごとのMRIDのキャッシュ
+_mr_id_cache: Dict[str, int] = {}
+
+
 # カレントのブランチのMRIDを取得
 def get_current_mr_id() -> int:
     """
     現在のブランチのMRIDを取得します。
+    見つかったMRIDはブランチ名ごとにキャッシュされ、同じブランチでの再検索を省略します。
 
     Returns:
         int: 現在のブランチのMRID
     """
     branch_name = get_current_branch()
+    mr_id = _mr_id_cache.get(branch_name)
+    if mr_id is not None:
+        return mr_id
+
     mr = get_merge_request(branch_name)
     if mr:
+        _mr_id_cache[branch_name] = mr.iid
         return mr.iid
     else:
         return "現在のブランチに関連するMerge Requestが見つかりません。"
 
 
+@mcp.tool()
+def refresh_context() -> str:
+    """キャッシュしたMR情報とGitLab APIのレスポンスを破棄し、最新の情報を再取得できるようにする"""
+    _mr_id_cache.clear()
+    clear_response_cache()
+    return "キャッシュをクリアしました。"
+
+
 @mcp.tool()
 def get_pipeline_failed_jobs() -> str:
     """GitLabパイプラインで失敗したジョブのコンソール出力を取得"""
@@ -92,38 +113,65 @@ def get_review_comments() -> str:
         return f"MR #{mr_id} への未解決の指摘事項はありません。"
 
 
+# テストモードで実行できるコマンド（関数, 引数の数）
+COMMANDS = {
+    "branch": (get_current_branch_name, 0),
+    "mr-id": (get_current_mr_id, 0),
+    "failed-jobs": (get_pipeline_failed_jobs, 0),
+    "review-comments": (get_review_comments, 0),
+    "review-changes": (get_review_changes, 0),
+}
+
+
+def run_all_commands() -> None:
+    """
+    テストモードのすべてのコマンドを並列に実行し、完了した順に結果を出力します。
+    """
+    # 各ツールで共通のMR IDを先に解決してキャッシュし、ツールごとの再検索を防ぐ
+    try:
+        get_current_mr_id()
+    except Exception:
+        # エラーは各コマンドの実行結果として出力する
+        pass
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            executor.submit(fn): name
+            for name, (fn, nargs) in COMMANDS.items()
+            if nargs == 0
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = f"エラー: {str(e)}"
+            print(f"# {futures[future]}\n{result}\n")
+
+
 if __name__ == "__main__":
     args = sys.argv[1:]
 
     if not args:
         mcp.run(transport="stdio")
+    elif args[0] == "test" and args[1:] == ["all"]:
+        run_all_commands()
     elif args[0] == "test" and len(args) >= 2:
-        if args[1] == "branch":
-            print(get_current_branch_name())
-        elif args[1] == "mr-id":
-            print(get_current_mr_id())
-        elif args[1] == "failed-jobs":
-            if len(args) == 2:
-                print(get_pipeline_failed_jobs())
-            else:
-                print("無効な引数です。使用方法: test failed-jobs [<mr_id>]")
-        elif args[1] == "review-comments":
-            if len(args) == 2:
-                print(get_review_comments())
-            else:
-                print("無効な引数です。使用方法: test review-comments [<mr_id>]")
-        elif args[1] == "review-changes":
-            if len(args) == 2:
-                print(get_review_changes())
-            else:
-                print("無効な引数です。使用方法: test review-changes [<mr_id>]")
-        else:
+        try:
+            fn, nargs = COMMANDS[args[1]]
+        except KeyError:
             print("無効なテスト引数です。")
+        else:
+            if len(args) - 2 == nargs:
+                print(fn(*args[2 : 2 + nargs]))
+            else:
+                print(f"無効な引数です。使用方法: test {args[1]}")
     else:
         print("""使用方法:
 python main.py                           # MCPサーバーを起動
+python main.py test all                  # すべてのテストを並列に実行
 python main.py test branch               # 現在のブランチ名を取得
-python main.py test failed-jobs [<mr_id>] # MR IDの失敗したジョブの出力を取得
-python main.py test review-comments [<mr_id>] # MR IDの未解決の指摘事項を取得
-python main.py test review-changes [<mr_id>] # MR IDの変更内容を取得
+python main.py test mr-id                # 現在のブランチのMR IDを取得
+python main.py test failed-jobs          # 現在のMRの失敗したジョブの出力を取得
+python main.py test review-comments      # 現在のMRの未解決の指摘事項を取得
+python main.py test review-changes       # 現在のMRの変更内容を取得
 """)
@@ -1,11 +1,53 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import io
 import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import git
 
+# git diff出力のファイルごとのヘッダ
+_DIFF_HEADER_PATTERN = re.compile(r"^diff --git ", re.MULTILINE)
 
+# gitがパスの出力に使用するCエスケープ（8進数表記以外）
+_C_ESCAPES = {
+    "a": 0x07,
+    "b": 0x08,
+    "t": 0x09,
+    "n": 0x0A,
+    "v": 0x0B,
+    "f": 0x0C,
+    "r": 0x0D,
+    '"': 0x22,
+    "\\": 0x5C,
+}
+
+# リポジトリパスごとのgit.Repoインスタンスのキャッシュ
+_repo_cache: Dict[str, git.Repo] = {}
+
+
+def _get_repo(repo_path: str) -> git.Repo:
+    """
+    指定されたパスのgit.Repoインスタンスを取得します。
+    一度生成したインスタンスはプロセス内で再利用されます。
+
+    Args:
+        repo_path (str): Gitリポジトリのパス
+
+    Returns:
+        git.Repo: Gitリポジトリインスタンス
+    """
+    repo = _repo_cache.get(repo_path)
+    if repo is None:
+        repo = git.Repo(repo_path)
+        _repo_cache[repo_path] = repo
+    return repo
+
+
+@lru_cache(maxsize=1)
 def get_git_repo_path() -> str:
     """
     環境変数からGitリポジトリのパスを取得します。
@@ -29,7 +71,7 @@ def get_git_repo_path() -> str:
 
     # パスがGitリポジトリかどうか確認
     try:
-        git.Repo(repo_path)
+        _get_repo(repo_path)
     except git.exc.InvalidGitRepositoryError:
         raise ValueError(f"指定されたパス {repo_path} はGitリポジトリではありません。")
 
@@ -48,7 +90,7 @@ def get_current_branch() -> str:
     """
     try:
         repo_path = get_git_repo_path()
-        repo = git.Repo(repo_path)
+        repo = _get_repo(repo_path)
 
         # アクティブなブランチ名を取得
         branch_name = repo.active_branch.name
@@ -69,15 +111,16 @@ def get_remote_url() -> str:
     """
     try:
         repo_path = get_git_repo_path()
-        repo = git.Repo(repo_path)
+        repo = _get_repo(repo_path)
 
         # originリモートを取得
-        for remote in repo.remotes:
-            if remote.name == "origin":
-                # リモートURLを取得（最初のURLを使用）
-                return remote.urls.__next__()
+        try:
+            origin = repo.remote("origin")
+        except ValueError:
+            raise ValueError("'origin'リモートが見つかりません。")
 
-        raise ValueError("'origin'リモートが見つかりません。")
+        # リモートURLを設定ファイルから直接取得（gitコマンドは起動しない）
+        return origin.url
     except Exception as e:
         raise ValueError(f"リモートURLの取得に失敗しました: {str(e)}")
 
@@ -106,6 +149,127 @@ def get_project_name_from_remote() -> str:
         raise ValueError(f"プロジェクト名の抽出に失敗しました: {str(e)}")
 
 
+def _unquote_path(path: str) -> str:
+    """
+    gitがダブルクォートとCエスケープで出力したパスを元のパスに戻します。
+    クォートされていないパスはそのまま返します。
+
+    Args:
+        path (str): git diffの出力に含まれるパス
+
+    Returns:
+        str: エスケープを解除したパス
+    """
+    if len(path) < 2 or not (path.startswith('"') and path.endswith('"')):
+        return path
+
+    quoted = path[1:-1].encode("utf-8")
+    unquoted = bytearray()
+    i = 0
+    while i < len(quoted):
+        if quoted[i] == ord("\\") and i + 1 < len(quoted):
+            escape = chr(quoted[i + 1])
+            if escape in "01234567":
+                # 8進数表記はバイト値（UTF-8の各バイトなど）を表す
+                unquoted.append(int(quoted[i + 1 : i + 4], 8))
+                i += 4
+            else:
+                unquoted.append(_C_ESCAPES.get(escape, quoted[i + 1]))
+                i += 2
+        else:
+            unquoted.append(quoted[i])
+            i += 1
+
+    return unquoted.decode("utf-8", errors="replace")
+
+
+def _parse_raw_records(diff_output: str) -> Tuple[List[Tuple[str, str]], str]:
+    """
+    `git diff --raw -z --patch` の出力を変更ファイルの一覧と差分本体とに分けます。
+
+    Args:
+        diff_output (str): git diffの出力
+
+    Returns:
+        Tuple[List[Tuple[str, str]], str]: (変更の種類, 変更後のパス) のリストと差分本体
+    """
+    records: List[Tuple[str, str]] = []
+    pos = 0
+
+    # 各レコードは ":<モード> <モード> <SHA> <SHA> <種類>\0<パス>\0" 形式
+    # 名前変更とコピーの場合は変更前後の2つのパスが続く
+    while diff_output.startswith(":", pos):
+        end = diff_output.index("\0", pos)
+        change_type_code = diff_output[pos:end].rsplit(" ", 1)[-1]
+        path_count = 2 if change_type_code[:1] in ("R", "C") else 1
+        for _ in range(path_count):
+            start = end + 1
+            end = diff_output.index("\0", start)
+        records.append((change_type_code, diff_output[start:end]))
+        pos = end + 1
+
+    # 一覧と差分本体の間はNUL文字で区切られる
+    return records, diff_output[pos:].lstrip("\0")
+
+
+def _get_diff_file_path(file_diff: str) -> Optional[str]:
+    """
+    1ファイル分のgit diff出力から変更後のファイルパスを取得します。
+
+    Args:
+        file_diff (str): "diff --git " で始まる1ファイル分の差分
+
+    Returns:
+        Optional[str]: 変更後のファイルパス。特定できない場合はNone
+    """
+    header, _, body = file_diff.partition("\n")
+    header = header[len("diff --git ") :]
+
+    # 名前変更の場合はヘッダ直後の拡張ヘッダに変更後のパスが含まれる
+    for line in body.split("\n"):
+        if line.startswith("rename to "):
+            return _unquote_path(line[len("rename to ") :])
+        if line.startswith(("---", "@@", "Binary files")):
+            break
+
+    # 特殊な文字を含むパスは "\"a/<path>\" \"b/<path>\"" 形式でクォートされる
+    if header.startswith('"'):
+        half = (len(header) - 1) // 2
+        old_path, new_path = header[:half], header[half + 1 :]
+        if old_path.startswith('"a/') and new_path == f'"b/{old_path[3:]}':
+            return _unquote_path(f'"{old_path[3:]}')
+        return None
+
+    # それ以外は "a/<path> b/<path>" 形式のヘッダからパスを取得
+    path = header[2 : 2 + (len(header) - len("a/ b/")) // 2]
+    if header == f"a/{path} b/{path}":
+        return path
+    return None
+
+
+def _split_diff_by_file(full_diff: str) -> Dict[str, str]:
+    """
+    git diffの出力をファイルごとの差分に分割します。
+
+    Args:
+        full_diff (str): 複数ファイル分のgit diff出力
+
+    Returns:
+        Dict[str, str]: 変更後のファイルパスをキーとしたファイルごとの差分
+    """
+    file_diffs: Dict[str, str] = {}
+    for chunk in _DIFF_HEADER_PATTERN.split(full_diff):
+        if not chunk:
+            continue
+
+        file_diff = f"diff --git {chunk}".rstrip("\n")
+        file_path = _get_diff_file_path(file_diff)
+        if file_path:
+            file_diffs[file_path] = file_diff
+
+    return file_diffs
+
+
 def get_diff_from_base(base_sha: str) -> str:
     """
     指定されたベースSHAから現在の状態までの差分を取得します。
@@ -122,29 +286,33 @@ def get_diff_from_base(base_sha: str) -> str:
     """
     try:
         repo_path = get_git_repo_path()
-        repo = git.Repo(repo_path)
+        repo = _get_repo(repo_path)
 
-        # 変更されたファイルのリストを取得
-        change_details = []
+        # 変更内容を書き込むバッファ
+        change_details = io.StringIO()
 
         # リポジトリの現在の状態（インデックスと作業ディレクトリ）をベースSHAと比較
-        diff_index = repo.git.diff(base_sha, name_status=True).strip()
-
-        if not diff_index:
+        # 変更ファイルの一覧（--raw）と差分本体（--patch）を1回のgit diffで取得する
+        # 一覧は-zでパスをクォートせずに出力させ、差分のヘッダとの突き合わせに使う
+        # diff.noprefixなどのユーザー設定に関わらず、ヘッダを "a/" "b/" 形式に固定する
+        diff_output = repo.git(c="core.quotepath=false").diff(
+            base_sha,
+            raw=True,
+            z=True,
+            patch=True,
+            unified=3,
+            src_prefix="a/",
+            dst_prefix="b/",
+        )
+
+        if not diff_output.strip("\0\n"):
             return "変更されたファイルはありません。"
 
-        # 変更されたファイルごとに詳細な差分を取得
-        for line in diff_index.split("\n"):
-            if not line:
-                continue
-
-            parts = line.split("\t")
-            if len(parts) < 2:
-                continue
-
-            change_type_code = parts[0]
-            file_path = parts[1]
+        records, patch_output = _parse_raw_records(diff_output)
+        file_diffs = _split_diff_by_file(patch_output)
 
+        # 名前変更の場合、file_pathは変更後のパス
+        for change_type_code, file_path in records:
             # 変更の種類を判定
             change_type = "変更"
             if change_type_code.startswith("A"):
@@ -154,19 +322,37 @@ def get_diff_from_base(base_sha: str) -> str:
             elif change_type_code.startswith("R"):
                 change_type = "名前変更"
 
+            if change_details.tell():
+                change_details.write("\n\n")
+
             # ファイルの差分を取得
             try:
-                file_diff = repo.git.diff(base_sha, file_path, unified=3)
-                change_details.append(
-                    f"# ファイル: {file_path} ({change_type})\n```diff\n{file_diff}\n```"
-                )
+                file_diff = file_diffs.get(file_path)
+                if file_diff is None:
+                    # 一括差分から特定できなかった場合はファイル単位で取得
+                    file_diff = repo.git(literal_pathspecs=True).diff(
+                        base_sha,
+                        "--",
+                        file_path,
+                        unified=3,
+                        src_prefix="a/",
+                        dst_prefix="b/",
+                    )
+                if not file_diff:
+                    raise ValueError("差分が空です。")
             except Exception as e:
                 # 特定のファイルの差分取得に失敗した場合はエラーメッセージを追加
-                change_details.append(
+                change_details.write(
                     f"# ファイル: {file_path} ({change_type})\n```\n差分の取得に失敗しました: {str(e)}\n```"
                 )
+                continue
+
+            # 差分本体はf-stringに埋め込まず、そのままバッファに書き込む
+            change_details.write(f"# ファイル: {file_path} ({change_type})\n```diff\n")
+            change_details.write(file_diff)
+            change_details.write("\n```")
 
-        return "\n\n".join(change_details)
+        return change_details.getvalue()
 
     except Exception as e:
         raise ValueError(f"差分の取得に失敗しました: {str(e)}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Optional
+
+import gitlab
+
+# MRの最新パイプラインと失敗したジョブを一括で取得するクエリ
+MR_FAILED_JOBS_QUERY = """
+query($projectPath: ID!, $iid: String!) {
+  project(fullPath: $projectPath) {
+    mergeRequest(iid: $iid) {
+      iid
+      headPipeline {
+        id
+        status
+        jobs(statuses: [FAILED], retried: false) {
+          nodes {
+            id
+            name
+            status
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def execute_graphql(
+    gl: gitlab.Gitlab, query: str, variables: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    GitLabのGraphQL APIにクエリを送信します。
+
+    Args:
+        gl (gitlab.Gitlab): GitLabクライアントインスタンス
+        query (str): GraphQLクエリ
+        variables (Optional[Dict[str, Any]]): クエリ変数
+
+    Returns:
+        Dict[str, Any]: レスポンスのdata部
+
+    Raises:
+        ValueError: クエリの実行結果にエラーが含まれる場合
+    """
+    result = gl.http_post(
+        f"{gl.url}/api/graphql",
+        post_data={"query": query, "variables": variables or {}},
+    )
+
+    errors = result.get("errors")
+    if errors:
+        messages = ", ".join(error.get("message", "") for error in errors)
+        raise ValueError(f"GraphQLクエリの実行に失敗しました: {messages}")
+
+    return result.get("data") or {}
+
+
+def parse_global_id(global_id: str) -> int:
+    """
+    GraphQLのグローバルID（例: gid://gitlab/Ci::Build/123）から数値IDを取り出します。
+
+    Args:
+        global_id (str): GraphQLのグローバルID
+
+    Returns:
+        int: REST APIで使用する数値ID
+    """
+    return int(global_id.rsplit("/", 1)[-1])
+
+
+def get_merge_request_failed_jobs(
+    gl: gitlab.Gitlab, project_path: str, mr_iid: int
+) -> Optional[Dict[str, Any]]:
+    """
+    MRの最新パイプラインと、そのパイプラインで失敗したジョブを1回のリクエストで取得します。
+
+    Args:
+        gl (gitlab.Gitlab): GitLabクライアントインスタンス
+        project_path (str): プロジェクトのフルパス（例: group/project）
+        mr_iid (int): Merge Request ID
+
+    Returns:
+        Optional[Dict[str, Any]]: MR情報（headPipelineを含む）。MRが見つからない場合はNone
+    """
+    data = execute_graphql(
+        gl,
+        MR_FAILED_JOBS_QUERY,
+        {"projectPath": project_path, "iid": str(mr_iid)},
+    )
+
+    project = data.get("project") or {}
+    return project.get("mergeRequest")
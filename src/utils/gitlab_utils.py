@@ -1,16 +1,47 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import io
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import gitlab
+import requests
+import requests_cache
 from gitlab.v4.objects import MergeRequest, Project
+from requests.adapters import HTTPAdapter
 
 from src.utils.git_utils import get_diff_from_base
+from src.utils.gitlab_graphql import get_merge_request_failed_jobs, parse_global_id
+
+# GitLabへの同時リクエスト数の上限（レートリミット対策）
+MAX_CONCURRENT_REQUESTS = 8
+
+# GitLab APIレスポンスのキャッシュ有効期限（秒）
+CACHE_EXPIRE_SECONDS = 180
+
+# ジョブのコンソール出力として保持する末尾のバイト数
+MAX_TRACE_TAIL_BYTES = 64 * 1024
+
+# ジョブのコンソール出力を読み込む単位（バイト）
+TRACE_CHUNK_SIZE = 8192
+
+# メモリに保持するジョブのコンソール出力の最大件数
+MAX_CACHED_TRACES = 32
+
+# ディスカッション一覧の1ページあたりの取得件数
+DISCUSSIONS_PER_PAGE = 100
+
+# 失敗したジョブを調べる必要のないパイプラインのステータス
+PIPELINE_STATUSES_WITHOUT_FAILURES = ("SUCCESS", "PENDING", "CREATED")
 
 
 # GitLab URLの取得
+@lru_cache(maxsize=1)
 def get_gitlab_url() -> str:
     """
     環境変数からGitLabのURLを取得します。
@@ -28,6 +59,7 @@ def get_gitlab_url() -> str:
 
 
 # プロジェクトID
+@lru_cache(maxsize=1)
 def get_gitlab_project_id() -> str:
     """
     環境変数からGitLabのプロジェクトIDを取得します。
@@ -44,9 +76,55 @@ def get_gitlab_project_id() -> str:
     return project_id
 
 
+@lru_cache(maxsize=1)
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    GitLab APIへの並列リクエストに使用するスレッドプールを取得します。
+    スレッドプールはプロセス内で共有され、同時リクエスト数の上限も全体で共有されます。
+
+    Returns:
+        ThreadPoolExecutor: 共有スレッドプール
+    """
+    return ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="gitlab-api"
+    )
+
+
+def _create_cached_session() -> requests_cache.CachedSession:
+    """
+    GitLab APIのGETレスポンスをディスクにキャッシュするセッションを生成します。
+    有効期限切れのレスポンスは、セッションの生成時にキャッシュから削除されます。
+
+    Returns:
+        requests_cache.CachedSession: キャッシュ付きHTTPセッション
+    """
+    session = requests_cache.CachedSession(
+        "gitlab_mcp",
+        backend="sqlite",
+        use_cache_dir=True,
+        expire_after=CACHE_EXPIRE_SECONDS,
+        # トレースは全文を読み込まずにストリーミングするため、HTTPキャッシュの対象外とする
+        urls_expire_after={"*/jobs/*/trace": requests_cache.DO_NOT_CACHE},
+        allowable_methods=("GET",),
+        # アクセストークンをキャッシュに保存しない
+        ignored_parameters=["PRIVATE-TOKEN"],
+    )
+
+    # 期限切れのレスポンスは再度リクエストされない限り残り続けるため、起動時に削除
+    session.cache.delete(expired=True)
+
+    # 並列リクエストの数だけkeep-alive接続をプールし、TCP/TLSハンドシェイクを再利用
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
 def get_gitlab_client() -> gitlab.Gitlab:
     """
     GitLabクライアントを取得します。
+    クライアントはプロセス内でキャッシュされ、すべてのツール呼び出しで共有されます。
 
     Returns:
         gitlab.Gitlab: GitLabクライアントインスタンス
@@ -63,28 +141,36 @@ def get_gitlab_client() -> gitlab.Gitlab:
     # GitLabのURLを取得
     gitlab_url = get_gitlab_url()
 
-    # 接続方法を順番に試行
-    connection_urls = [
-        gitlab_url,
-    ]
+    # トークンは各リクエストに付与されるため、gl.auth()による/userへの問い合わせは行わない
+    # 不正なトークンは最初のAPIリクエスト（プロジェクトの取得）でエラーになる
+    try:
+        return gitlab.Gitlab(
+            gitlab_url,
+            private_token=gitlab_api_key,
+            session=_create_cached_session(),
+        )
+    except Exception as e:
+        raise ValueError(f"GitLabへの接続に失敗しました: {str(e)}")
 
-    last_error = None
-    for url in connection_urls:
-        try:
-            gl = gitlab.Gitlab(url, private_token=gitlab_api_key)
-            gl.auth()
-            return gl
-        except Exception as e:
-            last_error = e
-            continue
 
-    # すべての接続方法が失敗した場合
-    raise ValueError(f"GitLabへの接続に失敗しました: {str(last_error)}")
+def clear_response_cache() -> None:
+    """
+    ディスクにキャッシュしたGitLab APIのレスポンスと、
+    メモリに保持したジョブのコンソール出力を削除します。
+    """
+    with _trace_tail_cache_lock:
+        _trace_tail_cache.clear()
+
+    session = get_gitlab_client().session
+    if isinstance(session, requests_cache.CachedSession):
+        session.cache.clear()
 
 
+@lru_cache(maxsize=1)
 def get_gitlab_project() -> Project:
     """
     GitLabプロジェクトを取得します。
+    取得したプロジェクトはプロセス内でキャッシュされます。
 
     Returns:
         Project: GitLabプロジェクトインスタンス
@@ -102,7 +188,7 @@ def get_gitlab_project() -> Project:
             return project
         except gitlab.exceptions.GitlabGetError:
             # IDでの取得に失敗した場合は検索を試行
-            projects = gl.projects.list(search=project_id)
+            projects = gl.projects.list(search=project_id, per_page=1, get_all=False)
             if projects:
                 return projects[0]
 
@@ -134,16 +220,35 @@ def get_merge_request(
     try:
         project = get_gitlab_project()
 
-        # 各状態のMRを順番に検索
-        for state in ["opened", "merged", "closed"]:
-            mrs = project.mergerequests.list(source_branch=branch_name, state=state)
+        # 各状態のMRを並列に検索し、opened → merged → closed の優先順で選択
+        states = ("opened", "merged", "closed")
+        executor = _get_executor()
+
+        # 最新のMRのみを使用するため、各状態で1件だけ取得
+        futures = {
+            state: executor.submit(
+                project.mergerequests.list,
+                source_branch=branch_name,
+                state=state,
+                order_by="updated_at",
+                sort="desc",
+                per_page=1,
+                get_all=False,
+            )
+            for state in states
+        }
+        results = {state: future.result() for state, future in futures.items()}
+
+        for state in states:
+            mrs = results[state]
             if mrs:
                 # 最新のMRを使用
                 mr = mrs[0]
 
                 # パイプライン情報も取得
-                if hasattr(mr, "pipeline") and mr.pipeline:
-                    mr.pipeline = project.pipelines.get(mr.pipeline["id"])
+                pipeline = mr.attributes.get("pipeline")
+                if pipeline:
+                    mr.pipeline = project.pipelines.get(pipeline["id"])
 
                 return mr
 
@@ -173,48 +278,136 @@ def get_failed_jobs_output(mr_id: int) -> str:
         ValueError: ジョブ出力の取得に失敗した場合
     """
     try:
+        gl = get_gitlab_client()
         project = get_gitlab_project()
 
-        # MRを取得
-        mr = project.mergerequests.get(mr_id)
+        # MRの最新パイプラインと失敗したジョブをGraphQLで一括取得
+        mr = get_merge_request_failed_jobs(gl, project.path_with_namespace, mr_id)
+        if mr is None:
+            raise ValueError(f"MR ID #{mr_id} が見つかりません。")
 
         # パイプライン情報を取得
-        if not hasattr(mr, "pipelines") or not mr.pipelines:
+        head_pipeline = mr.get("headPipeline")
+        if not head_pipeline:
             return ""
 
-        # パイプラインを取得し、最新のものを選択
-        pipelines = mr.pipelines.list()
-        if not pipelines:
+        # 成功済み・未実行のパイプラインはジョブを調べずに終了
+        if head_pipeline.get("status") in PIPELINE_STATUSES_WITHOUT_FAILURES:
             return ""
 
-        # 最新のパイプラインを取得 (GitLabのAPIはデフォルトで降順)
-        latest_pipeline = pipelines[0]
-        pipeline_detail = project.pipelines.get(latest_pipeline.id)
-
-        # 失敗したジョブを検索
-        failed_jobs = [
-            job for job in pipeline_detail.jobs.list() if job.status == "failed"
-        ]
-
+        failed_jobs = head_pipeline["jobs"]["nodes"]
         if not failed_jobs:
             return ""  # 失敗したジョブがない場合は空文字列を返す
 
-        # 失敗したジョブのコンソール出力を取得
-        outputs = []
-        for job in failed_jobs:
-            job_detail = project.jobs.get(job.id)
-            job_output = job_detail.trace()
-            outputs.append(
-                f"# ジョブ: {job.name}\n- ステータス: {job.status}\n- 出力:\n```\n{job_output}\n```"
+        # 失敗したジョブのコンソール出力を並列に取得
+        # ジョブのトレースはGraphQLで取得できないためREST APIを使用
+        traces = _fetch_job_traces(
+            project, [parse_global_id(job["id"]) for job in failed_jobs]
+        )
+
+        # コンソール出力はf-stringに埋め込まず、そのままバッファに書き込む
+        outputs = io.StringIO()
+        for job, job_output in zip(failed_jobs, traces):
+            if outputs.tell():
+                outputs.write("\n\n")
+
+            job_status = job["status"].lower()
+            outputs.write(
+                f"# ジョブ: {job['name']}\n- ステータス: {job_status}\n- 出力:\n```\n"
             )
+            outputs.write(job_output)
+            outputs.write("\n```")
 
-        return "\n\n".join(outputs)
-    except gitlab.exceptions.GitlabGetError:
-        raise ValueError(f"MR ID #{mr_id} が見つかりません。")
+        return outputs.getvalue()
+    except ValueError as e:
+        # 既存のValueErrorを再送出
+        raise e
     except Exception as e:
         raise ValueError(f"失敗したジョブの出力取得に失敗しました: {str(e)}")
 
 
+# ジョブIDごとのコンソール出力（末尾のみ）のキャッシュ
+# 失敗したジョブの出力は変化しないため期限は設けず、件数の上限を超えたら古い順に破棄する
+_trace_tail_cache: "OrderedDict[int, str]" = OrderedDict()
+_trace_tail_cache_lock = threading.Lock()
+
+
+def _get_cached_trace(job_id: int) -> Optional[str]:
+    """
+    キャッシュからジョブのコンソール出力を取得します。
+
+    Args:
+        job_id (int): ジョブID
+
+    Returns:
+        Optional[str]: キャッシュされたコンソール出力。存在しない場合はNone
+    """
+    with _trace_tail_cache_lock:
+        trace = _trace_tail_cache.get(job_id)
+        if trace is not None:
+            _trace_tail_cache.move_to_end(job_id)
+        return trace
+
+
+def _cache_trace(job_id: int, trace: str) -> None:
+    """
+    ジョブのコンソール出力をキャッシュします。
+    上限件数を超えた場合は、最も長く参照されていないものから破棄します。
+
+    Args:
+        job_id (int): ジョブID
+        trace (str): コンソール出力
+    """
+    with _trace_tail_cache_lock:
+        _trace_tail_cache[job_id] = trace
+        _trace_tail_cache.move_to_end(job_id)
+        while len(_trace_tail_cache) > MAX_CACHED_TRACES:
+            _trace_tail_cache.popitem(last=False)
+
+
+def _fetch_job_traces(project: Project, job_ids: List[int]) -> List[str]:
+    """
+    複数のジョブのコンソール出力を並列に取得します。
+    出力が大きい場合は末尾のMAX_TRACE_TAIL_BYTESバイトのみを返します。
+    取得した出力はジョブIDごとにプロセス内でキャッシュされます。
+
+    Args:
+        project (Project): GitLabプロジェクトインスタンス
+        job_ids (List[int]): ジョブIDのリスト
+
+    Returns:
+        List[str]: ジョブIDと同じ順序で並んだコンソール出力のリスト
+    """
+
+    def fetch_trace(job_id: int) -> str:
+        cached_trace = _get_cached_trace(job_id)
+        if cached_trace is not None:
+            return cached_trace
+
+        # lazy=Trueでジョブ詳細の取得を省略し、トレースのみをリクエスト
+        job = project.jobs.get(job_id, lazy=True)
+
+        # エラー原因は末尾に出力されるため、ストリーミングしながら末尾のみを保持
+        tail = bytearray()
+        truncated = False
+        for chunk in job.trace(
+            streamed=True, iterator=True, chunk_size=TRACE_CHUNK_SIZE
+        ):
+            tail += chunk
+            if len(tail) > MAX_TRACE_TAIL_BYTES:
+                del tail[:-MAX_TRACE_TAIL_BYTES]
+                truncated = True
+
+        trace = tail.decode("utf-8", errors="replace")
+        if truncated:
+            trace = f"（先頭部分を省略し、末尾{MAX_TRACE_TAIL_BYTES // 1024}KBのみを表示）\n{trace}"
+
+        _cache_trace(job_id, trace)
+        return trace
+
+    return list(_get_executor().map(fetch_trace, job_ids))
+
+
 def get_mr_comments(mr_id: int) -> str:
     """
     指定したMR IDに関連するMRの指摘事項（コメント）を取得します。
@@ -231,6 +424,7 @@ def get_mr_comments(mr_id: int) -> str:
         ValueError: コメントの取得に失敗した場合
     """
     try:
+        gl = get_gitlab_client()
         project = get_gitlab_project()
 
         # MRを取得
@@ -239,8 +433,12 @@ def get_mr_comments(mr_id: int) -> str:
         except gitlab.exceptions.GitlabGetError:
             return f"MR ID #{mr_id} が見つかりません。"
 
+        # ユーザーのコメントが1件もなければディスカッションの取得自体を省略
+        if mr.attributes.get("user_notes_count") == 0:
+            return f"MR #{mr.iid} へのコメントはありません。"
+
         # MRのディスカッション（スレッド）を取得
-        discussions = mr.discussions.list()
+        discussions = _list_discussions(gl, mr)
 
         if not discussions:
             return f"MR #{mr.iid} へのコメントはありません。"
@@ -263,6 +461,46 @@ def get_mr_comments(mr_id: int) -> str:
         raise ValueError(f"MRへの指摘事項の取得に失敗しました: {str(e)}")
 
 
+def _list_discussions(gl: gitlab.Gitlab, mr: MergeRequest) -> List[Dict[str, Any]]:
+    """
+    MRのすべてのディスカッションを取得します。
+    1ページ目で総ページ数を確認し、2ページ目以降は並列に取得します。
+
+    Args:
+        gl (gitlab.Gitlab): GitLabクライアントインスタンス
+        mr (MergeRequest): Merge Requestインスタンス
+
+    Returns:
+        List[Dict[str, Any]]: ページ順に並んだディスカッションのリスト
+    """
+
+    def fetch_page(page: int) -> requests.Response:
+        return gl.http_get(
+            mr.discussions.path,
+            query_data={"per_page": DISCUSSIONS_PER_PAGE, "page": page},
+            raw=True,
+        )
+
+    first_page = fetch_page(1)
+    discussions: List[Dict[str, Any]] = first_page.json()
+
+    # 件数が多い場合、GitLabは総ページ数を返さないため次ページを順に取得
+    total_pages = first_page.headers.get("X-Total-Pages")
+    if not total_pages:
+        next_page = first_page.headers.get("X-Next-Page")
+        while next_page:
+            response = fetch_page(int(next_page))
+            discussions.extend(response.json())
+            next_page = response.headers.get("X-Next-Page")
+        return discussions
+
+    pages = range(2, int(total_pages) + 1)
+    for response in _get_executor().map(fetch_page, pages):
+        discussions.extend(response.json())
+
+    return discussions
+
+
 def process_discussion(discussion: Dict[str, Any]) -> List[str]:
     """
     ディスカッション（スレッド）内のノートを処理し、未解決のコメントを抽出します。
@@ -274,9 +512,6 @@ def process_discussion(discussion: Dict[str, Any]) -> List[str]:
     Returns:
         List[str]: 未解決のコメント文字列のリスト
     """
-    discussion_comments = []
-    has_unresolved_notes = False
-
     # ディスカッションにはノートの配列が含まれています
     notes = (
         discussion.attributes.get("notes", [])
@@ -284,44 +519,65 @@ def process_discussion(discussion: Dict[str, Any]) -> List[str]:
         else discussion.get("notes", [])
     )
 
-    for note in notes:
-        # システムノートは除外
-        if note.get("system", False):
-            continue
+    # 解決状態はディスカッション単位のため、解決済みならノートを走査せずに除外
+    first_note = notes[0] if notes else None
+    if (
+        first_note
+        and first_note.get("resolvable", False)
+        and first_note.get("resolved", False)
+    ):
+        return []
 
-        # 解決可能で、かつ解決済みのノートは除外
-        if note.get("resolvable", False) and note.get("resolved", False):
-            continue
+    return [_format_note(note) for note in notes if _is_unresolved_file_note(note)]
 
-        # コードとの関連付けがあるか確認
-        position = note.get("position", {})
-        file_path = position.get("new_path", "") if position else ""
 
-        # ファイルに紐づいていないコメントは除外
-        if not file_path:
-            continue
+def _is_unresolved_file_note(note: Dict[str, Any]) -> bool:
+    """
+    ノートが未解決かつファイルに紐づいたコメントかどうかを判定します。
 
-        # ここに到達したノートは未解決かつファイルに紐づいている
-        has_unresolved_notes = True
+    Args:
+        note: GitLabノート
 
-        author = note.get("author", {}).get("name", "不明なユーザー")
-        body = note.get("body", "")
-        line = position.get("new_line", "") if position else ""
+    Returns:
+        bool: 未解決かつファイルに紐づいている場合はTrue
+    """
+    # システムノートは除外
+    if note.get("system", False):
+        return False
 
-        location = (
-            f" (ファイル: {file_path}, 行: {line})"
-            if file_path and line
-            else f" (ファイル: {file_path})"
-        )
+    # 解決可能で、かつ解決済みのノートは除外
+    if note.get("resolvable", False) and note.get("resolved", False):
+        return False
 
-        discussion_comments.append(
-            f"# 対象: {location}\n- コメント者: {author}\n- コメント:\n```\n{body}\n```"
-        )
+    # ファイルに紐づいていないコメントは除外
+    position = note.get("position") or {}
+    return bool(position.get("new_path"))
+
+
+def _format_note(note: Dict[str, Any]) -> str:
+    """
+    ファイルに紐づいたノートをAIが理解しやすい形式に整形します。
+
+    Args:
+        note: GitLabノート
+
+    Returns:
+        str: 整形されたコメント文字列
+    """
+    position = note.get("position") or {}
+    file_path = position.get("new_path", "")
+    line = position.get("new_line", "")
+
+    author = note.get("author", {}).get("name", "不明なユーザー")
+    body = note.get("body", "")
+
+    location = (
+        f" (ファイル: {file_path}, 行: {line})"
+        if file_path and line
+        else f" (ファイル: {file_path})"
+    )
 
-    # ディスカッションに未解決のノートがある場合のみ、そのコメントを返す
-    if has_unresolved_notes:
-        return discussion_comments
-    return []
+    return f"# 対象: {location}\n- コメント者: {author}\n- コメント:\n```\n{body}\n```"
 
 
 def get_mr_changes(mr_id: int) -> str:
@@ -348,10 +604,11 @@ def get_mr_changes(mr_id: int) -> str:
             return f"MR ID #{mr_id} が見つかりません。"
 
         # MRのdiff_refsからbase_shaを取得
-        if not hasattr(mr, "diff_refs") or not mr.diff_refs:
+        diff_refs = mr.attributes.get("diff_refs")
+        if not diff_refs:
             return f"MR #{mr.iid} の差分情報が取得できません。"
 
-        base_sha: Optional[str] = mr.diff_refs.get("base_sha")
+        base_sha: Optional[str] = diff_refs.get("base_sha")
         if not base_sha:
             return f"MR #{mr.iid} のベースコミットが特定できません。"
 